@@ -13,7 +13,8 @@ Processing notes:
   appointing president.
 - Transform USCA into codes: 1-11; FC (Federal Circuit); CIT (Court of
   International Trade); and, DC (DC Circuit).
-- Replaces `,` with `<` in the names of the judges for further processing.
+- Replaces `,` with `<` in the names of the judges written out for further
+  processing (judgeClass splits lines on `,` and names on `<`).
 - use FJC's termination date for the end of a commission; senior status is
   there, but typically it varies how often a judge keeps serving under senior
   status.
@@ -25,13 +26,18 @@ Processing notes:
   an added entry.
 - Carolyn Dineen King wrote as Carolyn Dineen Randall until 1988.
 - Multi word names are O' and Van prefixes.
+- FJC judge names are quoted `Last, First` fields, so the export has to go
+  through the csv module rather than a plain `split(',')` of each line.
 """
 
 import argparse
 import csv
 import logging
 import re
-from datetime import datetime
+from collections import namedtuple
+from functools import lru_cache
+from datetime import date, datetime
+from operator import itemgetter
 
 
 court_map = {
@@ -51,91 +57,126 @@ court_map = {
     'U.S. Court of International Trade': 'CIT'
 }
 
+#  1 if the judge was appointed by a Democratic president and 0 if a Republican.
+party_map = {
+    'Democratic': 1,
+    'Republican': 0
+}
 
-def get_year(text):
-    pattern = "%Y-%m-%d"
-    year = None
-    try:
-        d = datetime.strptime(text, pattern)
-    except:
-        try:
-            d = datetime.stpftime(text[0:3] + '-01-01', pattern )
-        except:
-            d = None
-    if d is not None:
-        year = d.year
-    else:
-        year = None
-    return year
+# FJC columns used, in the order they are unpacked in commissions()
+fjc_columns = (
+    'Judge Name',
+    'Court Name',
+    'Party of Appointing President',
+    'Commission Date',
+    'Recess Appointment Date',
+    'Termination Date',
+)
+
+# read and write the FJC export in 1 MiB chunks
+io_buffer_size = 1 << 20
+
+# a commission as written to the output csv
+Row = namedtuple('Row', 'Judge Circuit Party StartYear EndYear')
+
+# judges also known under an earlier name: the alternate name and the year
+# the commission switches from the alternate name to the FJC one
+name_exceptions = {
+    # John Porfilio is correct in FJC, but Moore is an added entry
+    'Porfilio, John Carbone': ('Moore, John', 1996),
+    # Carolyn Dineen King wrote as Carolyn Dineen Randall until 1988
+    'King, Carolyn Dineen': ('Randall, Carolyn', 1988)
+}
 
+# multi word last name prefixes
+_VAN_O = re.compile("^(Van |O')")
 
-def main(args):
-    fjc_csv = csv.DictReader(open(args.input, newline='', encoding="UTF8"))
-    judge = {}
-    fieldnames = ['Judge', 'Circuit', 'Party', 'StartYear', 'EndYear']
-    out_csv = csv.DictWriter(open(args.output, 'w', newline='',
-            encoding="UTF8"),
-        fieldnames=fieldnames, extrasaction="ignore")
-    out_csv.writeheader()
-    previous_commission = { 'Judge': ''}
-
-    for row in fjc_csv:
-        commission = {}
-        # replace comma with '<' based on previous projects processing
-        commission['Judge'] = row['Judge Name'].replace(",", "<")
-        seat_id = row['Seat ID']
-        commission['SeatID'] = seat_id
-        commission['Circuit'] = court_map.get(row['Court Name'], '')
+
+@lru_cache(maxsize=None)
+def get_year(text):
+    """Year of an FJC `YYYY-MM-DD` date, or None if there isn't one
+
+    Full dates are validated, so an impossible date such as `1990-13-45` is
+    None. Shorter, partial dates fall back to their leading four digit year.
+    Results are cached, since many commissions share a date (or have none).
+    """
+    if len(text) == 10:
+        try:
+            return date.fromisoformat(text).year
+        except ValueError:
+            return None
+    if len(text) >= 4 and text[:4].isdigit():
+        return int(text[:4])
+    return None
+
+
+def commissions(fjc_csv):
+    """Yield a Row per circuit commission (and alternate name) in fjc_csv"""
+    header = next(fjc_csv, None)
+    # an empty export has no commissions
+    if header is None:
+        return
+    # only pull the columns we need out of each row
+    project = itemgetter(*[header.index(name) for name in fjc_columns])
+    # open commissions end in the current year
+    current_year = datetime.now().year
+    previous_judge = ''
+    previous_party = ''
+    # skip blank lines, as csv.DictReader did
+    rows = filter(None, fjc_csv)
+
+    for (judge_name_raw, court_name, party_raw, commission_date, recess_date,
+            termination_date) in map(project, rows):
         # handle appointing president party if its a move (5th to 11th)
-        if re.search('^None', row['Party of Appointing President']) or \
-                len(row['Party of Appointing President']) == 0:
-            if previous_commission['Judge'] == commission['Judge']:
-                commission['Party'] = previous_commission['Party']
+        if not party_raw or party_raw.startswith('None'):
+            if previous_judge == judge_name_raw:
+                party = previous_party
             else:
-                commission['Party'] = row['Party of Appointing President']
-        else:
-            commission['Party'] = row['Party of Appointing President']
-        party = commission['Party']
-        #  1 if the judge was appointed by a Democratic president and 0 if a Republican.
-
-        if party == 'Democratic':
-            commission['Party'] = 1
-        elif party == 'Republican':
-            commission['Party'] = 0
-        else:            
-            commission['Party'] = None
-        start_date_text = ''
-        if len(row.get('Commission Date', '')) == 0:
-            start_date_text =  row.get('Recess Appointment Date', '')
+                party = party_raw
         else:
-            start_date_text = row.get('Commission Date', '')
-        if len(start_date_text) > 0:
-            commission['StartYear'] = get_year(start_date_text)
-            commission['EndYear'] = get_year(row['Termination Date']) or \
-                datetime.now().year
-            if len(commission['Circuit']) > 0:
-                # exceptions and additions
-                alt_commission = None
-                if commission['Judge'] == 'Porfilio< John Carbone':
-                    alt_commission = commission.copy()
-                    alt_commission['Judge'] = 'Moore< John'
-                    alt_commission['EndYear'] = 1996
-                    commission['StartYear'] = 1996
-                # Carolyn Dineen King
-                elif commission['Judge'] == 'King< Carolyn Dineen':
-                    alt_commission = commission.copy()
-                    alt_commission['Judge'] = 'Randall< Carolyn'
-                    alt_commission['EndYear'] = 1988
-                    commission['StartYear'] = 1988
-                # handle Van
-                elif re.search("^(Van |O')", commission['Judge']):
-                    judge_name = re.sub("^(Van |O')", '', commission['Judge'])
-                    alt_commission = commission.copy()
-                    alt_commission['Judge'] = judge_name
-                out_csv.writerow(commission)
-                if alt_commission is not None:
-                    out_csv.writerow(alt_commission)
-        previous_commission = commission
+            party = party_raw
+        # carry the FJC party name forward, not its 1/0 code
+        previous_judge = judge_name_raw
+        previous_party = party
+        # only circuit commissions are kept, skip the rest (mostly district
+        # courts) before any date handling
+        circuit = court_map.get(court_name)
+        if not circuit:
+            continue
+        start_date_text = commission_date or recess_date
+        if not start_date_text:
+            continue
+        commission = Row(judge_name_raw, circuit, party_map.get(party),
+            get_year(start_date_text),
+            get_year(termination_date) or current_year)
+        # exceptions and additions
+        alt_commission = None
+        exception = name_exceptions.get(judge_name_raw)
+        if exception is not None:
+            alt_name, switch_year = exception
+            alt_commission = commission._replace(
+                Judge=alt_name, EndYear=switch_year)
+            commission = commission._replace(StartYear=switch_year)
+        # handle Van
+        elif _VAN_O.match(judge_name_raw):
+            alt_commission = commission._replace(
+                Judge=_VAN_O.sub('', judge_name_raw))
+        # replace comma with '<' based on previous projects processing, only
+        # for the commissions written out
+        for out in (commission, alt_commission):
+            if out is not None:
+                yield out._replace(Judge=out.Judge.replace(",", "<"))
+
+
+def main(args):
+    with open(args.input, newline='', encoding="UTF8",
+            buffering=io_buffer_size) as fjc_file, \
+            open(args.output, 'w', newline='', encoding="UTF8",
+                buffering=io_buffer_size) as out_file:
+        out_csv = csv.writer(out_file)
+        out_csv.writerow(Row._fields)
+        # stream commissions straight from the reader into the writer
+        out_csv.writerows(commissions(csv.reader(fjc_file)))
 
 
 def setup_logging(args):